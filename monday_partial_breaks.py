@@ -1,11 +1,10 @@
 import pandas as pd
 import numpy as np
-from collections import Counter
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.styles import Font, PatternFill, NamedStyle
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import List, Any
+from week_breaks import DAY_NAMES, compute_week_breaks, load_data
 
 # Configure logging
 logging.basicConfig(
@@ -14,156 +13,116 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def load_data(file_path: str) -> pd.DataFrame:
+# Style definitions
+TITLE_FONT = Font(bold=True, size=14)
+TITLE_FILL = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
+HEADER_FONT = Font(bold=True, size=12)
+HEADER_FILL = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+SUBHEADER_FILL = PatternFill(start_color="EEEEEE", end_color="EEEEEE", fill_type="solid")
+
+def analyze_partial_breaks(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, int]:
     """
-    Load and prepare the data for analysis.
+    Analyze Monday ranges and track partial breaks.
     
     Args:
-        file_path: Path to the CSV file containing candle data
+        df: DataFrame containing the candle data
         
     Returns:
-        DataFrame with prepared data
+        Tuple containing:
+        - only_high_broken: DataFrame of weeks where only high was broken
+        - only_low_broken: DataFrame of weeks where only low was broken
+        - neither_broken: DataFrame of weeks where neither was broken
+        - both_broken: DataFrame of weeks where both were broken
+        - total_mondays: Total number of Mondays analyzed
     """
-    try:
-        df = pd.read_csv(file_path, sep=';')
-        df['Date'] = pd.to_datetime(df['Date'])
-        df['DayOfWeek'] = df['Date'].dt.dayofweek
-        df['Week'] = df['Date'].dt.isocalendar().week
-        df['Year'] = df['Date'].dt.isocalendar().year
-        return df
-    except Exception as e:
-        logger.error(f"Error loading data: {str(e)}")
-        raise
+    return classify_partial_breaks(compute_week_breaks(df))
 
-def analyze_partial_breaks(df: pd.DataFrame) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], int]:
+def classify_partial_breaks(weeks: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, int]:
     """
-    Analyze Monday ranges and track partial breaks.
+    Split per-week Monday range breaks into partial break categories.
     
     Args:
-        df: DataFrame containing the candle data
+        weeks: Per-week break DataFrame as returned by compute_week_breaks
         
     Returns:
-        Tuple containing:
-        - only_high_broken: List of weeks where only high was broken
-        - only_low_broken: List of weeks where only low was broken
-        - neither_broken: List of weeks where neither was broken
-        - both_broken: List of weeks where both were broken
-        - total_mondays: Total number of Mondays analyzed
+        Same tuple as analyze_partial_breaks
     """
-    only_high_broken = []
-    only_low_broken = []
-    neither_broken = []
-    both_broken = []
-    total_mondays = 0
+    # Encode each week as 0=neither, 1=only high, 2=only low, 3=both broken
+    high_broken = weeks['HighBreakDay'].notna().to_numpy(dtype=np.uint8)
+    low_broken = weeks['LowBreakDay'].notna().to_numpy(dtype=np.uint8)
+    code = high_broken | (low_broken << 1)
 
-    for (week, year), week_data in df.groupby(['Week', 'Year']):
-        monday_data = week_data[week_data['DayOfWeek'] == 0]
-        if len(monday_data) == 0:
-            continue
-            
-        total_mondays += 1
-        monday_high = monday_data['High'].iloc[0]
-        monday_low = monday_data['Low'].iloc[0]
-        monday_date = monday_data['Date'].iloc[0]
-        
-        rest_of_week = week_data[week_data['DayOfWeek'].isin([1,2,3,4])]
-        
-        # Check high break
-        high_break_days = rest_of_week[rest_of_week['High'] > monday_high]
-        high_broken = not high_break_days.empty
-        
-        # Check low break
-        low_break_days = rest_of_week[rest_of_week['Low'] < monday_low]
-        low_broken = not low_break_days.empty
-        
-        # Store week data
-        week_info = {
-            'Date': monday_date,
-            'Week': week,
-            'Year': year,
-            'Monday High': monday_high,
-            'Monday Low': monday_low,
-            'High Break Day': high_break_days['DayOfWeek'].iloc[0] if high_broken else None,
-            'Low Break Day': low_break_days['DayOfWeek'].iloc[0] if low_broken else None
-        }
-        
-        if high_broken and not low_broken:
-            only_high_broken.append(week_info)
-        elif low_broken and not high_broken:
-            only_low_broken.append(week_info)
-        elif not high_broken and not low_broken:
-            neither_broken.append(week_info)
-        else:
-            both_broken.append(week_info)
+    # Flatten to the column layout used by the Excel writer
+    records = weeks.reset_index().rename(columns={
+        'MondayDate': 'Date',
+        'MondayHigh': 'Monday High',
+        'MondayLow': 'Monday Low',
+        'HighBreakDay': 'High Break Day',
+        'LowBreakDay': 'Low Break Day'
+    })[['Date', 'Week', 'Year', 'Monday High', 'Monday Low', 'High Break Day', 'Low Break Day']]
+
+    only_high_broken = records[code == 1]
+    only_low_broken = records[code == 2]
+    neither_broken = records[code == 0]
+    both_broken = records[code == 3]
+    total_mondays = len(weeks)
 
     return only_high_broken, only_low_broken, neither_broken, both_broken, total_mondays
 
-def day_to_name(day: Optional[int]) -> str:
+def day_names(days: pd.Series) -> List[str]:
     """
-    Convert day number to day name.
+    Convert a column of day numbers to day names.
     
     Args:
-        day: Day number (1=Tuesday, 2=Wednesday, etc.) or None
+        days: Day numbers (1=Tuesday, 2=Wednesday, etc.), missing where not broken
         
     Returns:
-        Day name as string or "Not Broken" if None
+        List of day names, "Not Broken" for missing days
     """
-    if day is None:
-        return "Not Broken"
-    day_names = {1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday', 4: 'Friday'}
-    return day_names.get(day, str(day))
+    return days.map(dict(enumerate(DAY_NAMES))).fillna("Not Broken").tolist()
 
-def write_section(ws: Any, title: str, data: List[Dict[str, Any]], start_row: int) -> int:
+def write_section(ws: Any, title: str, data: pd.DataFrame, start_row: int) -> int:
     """
     Write a section of data to the Excel worksheet.
     
     Args:
         ws: Excel worksheet object
         title: Section title
-        data: List of data dictionaries
+        data: DataFrame of weeks as returned by analyze_partial_breaks
         start_row: Starting row number
         
     Returns:
         Next available row number
     """
-    # Style definitions
-    header_font = Font(bold=True, size=12)
-    header_fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-    subheader_fill = PatternFill(start_color="EEEEEE", end_color="EEEEEE", fill_type="solid")
-    
     # Write title
     ws[f'A{start_row}'] = title
-    ws[f'A{start_row}'].font = header_font
-    ws[f'A{start_row}'].fill = header_fill
+    ws[f'A{start_row}'].style = 'section_title'
     
-    if not data:
+    if data.empty:
         ws[f'A{start_row + 1}'] = "No instances found"
         return start_row + 2
     
-    # Write headers
+    # Write headers (title row above makes append land on start_row + 1)
     headers = ['Date', 'Week', 'Year', 'Monday High', 'Monday Low', 'High Break Day', 'Low Break Day']
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=start_row + 1, column=col, value=header)
-        ws.cell(row=start_row + 1, column=col).font = header_font
-        ws.cell(row=start_row + 1, column=col).fill = subheader_fill
+    ws.append(headers)
+    for cell in ws[start_row + 1]:
+        cell.style = 'section_header'
     
     # Write data
-    for row_idx, week_data in enumerate(data, start_row + 2):
-        ws.cell(row=row_idx, column=1, value=week_data['Date'].strftime('%Y-%m-%d'))
-        ws.cell(row=row_idx, column=2, value=week_data['Week'])
-        ws.cell(row=row_idx, column=3, value=week_data['Year'])
-        ws.cell(row=row_idx, column=4, value=week_data['Monday High'])
-        ws.cell(row=row_idx, column=5, value=week_data['Monday Low'])
-        ws.cell(row=row_idx, column=6, value=day_to_name(week_data['High Break Day']))
-        ws.cell(row=row_idx, column=7, value=day_to_name(week_data['Low Break Day']))
+    high_names = day_names(data['High Break Day'])
+    low_names = day_names(data['Low Break Day'])
+    dates = data['Date'].dt.strftime('%Y-%m-%d')
+    rows = data[['Week', 'Year', 'Monday High', 'Monday Low']].itertuples(index=False, name=None)
+    for date, (week, year, monday_high, monday_low), high_name, low_name in zip(dates, rows, high_names, low_names):
+        ws.append([date, week, year, monday_high, monday_low, high_name, low_name])
     
-    return row_idx + 2
+    return ws.max_row + 2
 
 def create_excel_report(
-    only_high_broken: List[Dict[str, Any]],
-    only_low_broken: List[Dict[str, Any]],
-    neither_broken: List[Dict[str, Any]],
-    both_broken: List[Dict[str, Any]],
+    only_high_broken: pd.DataFrame,
+    only_low_broken: pd.DataFrame,
+    neither_broken: pd.DataFrame,
+    both_broken: pd.DataFrame,
     total_mondays: int,
     output_file: str
 ) -> None:
@@ -171,10 +130,10 @@ def create_excel_report(
     Create an Excel report with the analysis results.
     
     Args:
-        only_high_broken: List of weeks where only high was broken
-        only_low_broken: List of weeks where only low was broken
-        neither_broken: List of weeks where neither was broken
-        both_broken: List of weeks where both were broken
+        only_high_broken: DataFrame of weeks where only high was broken
+        only_low_broken: DataFrame of weeks where only low was broken
+        neither_broken: DataFrame of weeks where neither was broken
+        both_broken: DataFrame of weeks where both were broken
         total_mondays: Total number of Mondays analyzed
         output_file: Path to save the Excel file
     """
@@ -183,10 +142,14 @@ def create_excel_report(
         ws = wb.active
         ws.title = "Partial Break Analysis"
         
+        # Register the section styles used by write_section
+        wb.add_named_style(NamedStyle(name='section_title', font=HEADER_FONT, fill=HEADER_FILL))
+        wb.add_named_style(NamedStyle(name='section_header', font=HEADER_FONT, fill=SUBHEADER_FILL))
+        
         # Write summary
         ws['A1'] = "=== Monday Range Break Analysis ==="
-        ws['A1'].font = Font(bold=True, size=14)
-        ws['A1'].fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
+        ws['A1'].font = TITLE_FONT
+        ws['A1'].fill = TITLE_FILL
         
         ws['A3'] = f"Total number of Mondays analyzed: {total_mondays}"
         ws['A4'] = f"Number of weeks with only high broken: {len(only_high_broken)}"
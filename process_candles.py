@@ -1,8 +1,8 @@
 import pandas as pd
-import locale
-from datetime import datetime
 import logging
-from typing import Optional, Callable
+import os
+from typing import Optional
+from week_breaks import write_parquet_cache, PYARROW_AVAILABLE
 
 # Configure logging
 logging.basicConfig(
@@ -11,59 +11,92 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def parse_german_date(date_str: str) -> Optional[datetime]:
+# German month names as they appear in the raw export (e.g. "Montag, 1. Januar 2024")
+GERMAN_MONTHS = {
+    'Januar': 1, 'Februar': 2, 'März': 3, 'April': 4, 'Mai': 5, 'Juni': 6,
+    'Juli': 7, 'August': 8, 'September': 9, 'Oktober': 10, 'November': 11, 'Dezember': 12
+}
+
+# English column names for the raw export (Datum, Schlusskurs, Eröffnung, Tageshoch, Tagestief)
+COLUMNS = ['Date', 'Close', 'Open', 'High', 'Low']
+PRICE_DTYPES = {'Close': 'float64', 'Open': 'float64', 'High': 'float64', 'Low': 'float64'}
+
+def parse_german_dates(dates: pd.Series) -> pd.Series:
     """
-    Parse a German date string into a datetime object.
+    Parse German date strings into datetimes.
     
     Args:
-        date_str: Date string in German format (e.g., "Montag, 1. Januar 2024")
+        dates: Date strings in German format (e.g., "Montag, 1. Januar 2024")
         
     Returns:
-        datetime object if parsing successful, None otherwise
+        Series of datetimes, NaT where parsing failed
     """
-    try:
-        return pd.to_datetime(date_str, format='%A, %d. %B %Y')
-    except Exception as e:
-        logger.warning(f"Failed to parse date: {date_str}. Error: {str(e)}")
-        return None
+    parts = dates.str.extract(r',\s*(\d+)\.\s+(\w+)\s+(\d+)$')
+    return pd.to_datetime(pd.DataFrame({
+        'year': pd.to_numeric(parts[2]),
+        'month': parts[1].map(GERMAN_MONTHS),
+        'day': pd.to_numeric(parts[0])
+    }), errors='coerce')
 
-def process_candles(input_file: str, output_file: str) -> None:
+def week_keys(dates: pd.Series) -> pd.Series:
+    """
+    Build one integer key per ISO week (year * 100 + week).
+    
+    Args:
+        dates: Series of datetimes
+        
+    Returns:
+        Series of week keys
+    """
+    iso = dates.dt.isocalendar()
+    return iso['year'].astype('int64') * 100 + iso['week'].astype('int64')
+
+def process_candles(input_file: str, output_file: str, chunksize: Optional[int] = None) -> None:
     """
     Process candle data from a CSV file, filter for weeks with Mondays, and save to a new file.
     
     Args:
         input_file: Path to the input CSV file
         output_file: Path to save the filtered CSV file
+        chunksize: If set, stream the file in chunks of this many rows instead of loading it
+            at once; rows are then written in input order rather than sorted by date
     """
+    if chunksize is not None:
+        process_candles_chunked(input_file, output_file, chunksize)
+        return
+    
     try:
-        # Set locale to German
-        locale.setlocale(locale.LC_TIME, 'German')
-        
         # Read the CSV file
         logger.info(f"Reading data from {input_file}")
-        df = pd.read_csv(input_file, sep=';', encoding='latin1')
+        # Translate column headers to English and read prices (decimal comma) as floats
+        df = pd.read_csv(
+            input_file, sep=';', encoding='latin1', header=0, names=COLUMNS,
+            decimal=',', dtype=PRICE_DTYPES
+        )
         
-        # Translate column headers to English
-        df.columns = ['Date', 'Close', 'Open', 'High', 'Low']
-        
-        # Convert German date strings to datetime objects
-        df['Date'] = df['Date'].apply(parse_german_date)
+        # Convert German date strings to datetime objects (unparseable dates become NaT)
+        df['Date'] = parse_german_dates(df['Date'])
         
         # Remove any rows where date parsing failed
+        failed = df['Date'].isna().sum()
+        if failed:
+            logger.warning(f"Failed to parse {failed} date(s); dropping those rows")
         df = df.dropna(subset=['Date'])
         
         # Add a week number column
-        df['Week'] = df['Date'].dt.isocalendar().week
-        df['Year'] = df['Date'].dt.isocalendar().year
+        iso = df['Date'].dt.isocalendar()
+        df['Week'] = iso['week']
+        df['Year'] = iso['year']
         
         # Add a day of week column (Monday=0, Sunday=6)
         df['DayOfWeek'] = df['Date'].dt.dayofweek
         
-        # Find weeks that have a Monday
-        weeks_with_monday = df[df['DayOfWeek'] == 0][['Week', 'Year']].drop_duplicates()
+        # Flag every row whose week has a Monday
+        is_monday = (df['DayOfWeek'] == 0).astype('int8')
+        has_monday = is_monday.groupby([df['Year'], df['Week']]).transform('max').astype(bool)
         
         # Filter the dataframe to only keep weeks that have a Monday
-        filtered_df = pd.merge(df, weeks_with_monday, on=['Week', 'Year'])
+        filtered_df = df[has_monday]
         
         # Sort by date
         filtered_df = filtered_df.sort_values('Date')
@@ -73,7 +106,13 @@ def process_candles(input_file: str, output_file: str) -> None:
         
         # Save to new CSV file
         logger.info(f"Saving filtered data to {output_file}")
-        filtered_df.to_csv(output_file, index=False, sep=';', date_format='%Y-%m-%d')
+        filtered_df.to_csv(output_file, index=False, sep=';', decimal=',', date_format='%Y-%m-%d')
+        
+        # Cache a typed Parquet copy next to the CSV for the analysis scripts
+        if PYARROW_AVAILABLE:
+            parquet_file = os.path.splitext(output_file)[0] + '.parquet'
+            logger.info(f"Saving Parquet cache to {parquet_file}")
+            write_parquet_cache(filtered_df, parquet_file)
         
         logger.info(f"Processing complete!")
         logger.info(f"Original number of rows: {len(df)}")
@@ -83,5 +122,56 @@ def process_candles(input_file: str, output_file: str) -> None:
         logger.error(f"An error occurred during processing: {str(e)}")
         raise
 
+def process_candles_chunked(input_file: str, output_file: str, chunksize: int = 1_000_000) -> None:
+    """
+    Streaming version of process_candles that keeps at most one chunk in memory.
+    
+    The first pass reads only the Date column to find the weeks that have a Monday,
+    the second pass filters each chunk against those weeks and appends it to the output.
+    
+    Args:
+        input_file: Path to the input CSV file
+        output_file: Path to save the filtered CSV file
+        chunksize: Number of rows to read per chunk
+    """
+    try:
+        read_options = dict(sep=';', encoding='latin1', header=0, names=COLUMNS, decimal=',', chunksize=chunksize)
+        
+        # First pass: collect the weeks that contain a Monday
+        logger.info(f"Scanning {input_file} for weeks with a Monday")
+        monday_weeks = set()
+        for chunk in pd.read_csv(input_file, usecols=['Date'], **read_options):
+            dates = parse_german_dates(chunk['Date']).dropna()
+            monday_weeks.update(week_keys(dates[dates.dt.dayofweek == 0]))
+        
+        # Second pass: filter each chunk and append it to the output file
+        logger.info(f"Saving filtered data to {output_file}")
+        total_rows = 0
+        filtered_rows = 0
+        failed = 0
+        first_chunk = True
+        for chunk in pd.read_csv(input_file, dtype=PRICE_DTYPES, **read_options):
+            chunk['Date'] = parse_german_dates(chunk['Date'])
+            failed += chunk['Date'].isna().sum()
+            chunk = chunk.dropna(subset=['Date'])
+            filtered = chunk[week_keys(chunk['Date']).isin(monday_weeks)]
+            filtered.to_csv(
+                output_file, index=False, sep=';', decimal=',', date_format='%Y-%m-%d',
+                mode='w' if first_chunk else 'a', header=first_chunk
+            )
+            first_chunk = False
+            total_rows += len(chunk)
+            filtered_rows += len(filtered)
+        
+        if failed:
+            logger.warning(f"Failed to parse {failed} date(s); dropping those rows")
+        logger.info(f"Processing complete!")
+        logger.info(f"Original number of rows: {total_rows}")
+        logger.info(f"Filtered number of rows: {filtered_rows}")
+        
+    except Exception as e:
+        logger.error(f"An error occurred during processing: {str(e)}")
+        raise
+
 if __name__ == "__main__":
     process_candles('CME_DL_6E1!, 1D (2).csv', 'filtered_candles.csv') 
\ No newline at end of file
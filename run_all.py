@@ -0,0 +1,42 @@
+import logging
+
+from analyze_monday_ranges import print_results
+from week_breaks import load_data, compute_week_breaks, summarize_week_breaks, calculate_probabilities
+from monday_partial_breaks import classify_partial_breaks, create_excel_report
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def main():
+    try:
+        # Load data and find the Monday range breaks once for both analyses
+        weeks = compute_week_breaks(load_data('filtered_candles.csv'))
+
+        total_mondays, monday_highs_taken, monday_lows_taken, both_broken, day_high_break, day_low_break, _ = summarize_week_breaks(weeks)
+        only_high_broken, only_low_broken, neither_broken, both_broken_weeks, partial_total_mondays = classify_partial_breaks(weeks)
+
+        # Report Monday range probabilities
+        high_break_prob, low_break_prob, day_high_probs, day_low_probs = calculate_probabilities(
+            total_mondays, monday_highs_taken, monday_lows_taken, both_broken, day_high_break, day_low_break
+        )
+        print_results(
+            total_mondays, monday_highs_taken, monday_lows_taken, both_broken,
+            high_break_prob, low_break_prob, day_high_probs, day_low_probs
+        )
+
+        # Create partial break Excel report
+        create_excel_report(
+            only_high_broken, only_low_broken, neither_broken, both_broken_weeks,
+            partial_total_mondays, 'monday_partial_breaks.xlsx'
+        )
+
+    except Exception as e:
+        logger.error(f"An error occurred during analysis: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+import week_breaks
+from week_breaks import compute_week_breaks, load_data, scan_week_breaks
+
+# Three weeks of daily candles:
+# - 2024-01-01: high broken on Tuesday, low broken on Thursday, plus a Sunday row to ignore
+# - 2024-01-08: no Monday candle, so the week is skipped
+# - 2024-01-15: neither level broken (touching Monday's low is not a break)
+CANDLES = [
+    ('2024-01-01', 1.10, 1.00),
+    ('2024-01-02', 1.12, 1.01),
+    ('2024-01-03', 1.09, 1.02),
+    ('2024-01-04', 1.08, 0.99),
+    ('2024-01-05', 1.11, 0.98),
+    ('2024-01-07', 1.50, 0.50),
+    ('2024-01-09', 1.20, 0.90),
+    ('2024-01-10', 1.30, 0.80),
+    ('2024-01-15', 1.20, 1.00),
+    ('2024-01-16', 1.15, 1.05),
+    ('2024-01-17', 1.20, 1.00),
+    ('2024-01-19', 1.18, 1.00),
+]
+
+@pytest.fixture
+def candles_csv(tmp_path):
+    path = tmp_path / 'filtered_candles.csv'
+    pd.DataFrame(CANDLES, columns=['Date', 'High', 'Low']).to_csv(path, sep=';', decimal=',', index=False)
+    return str(path)
+
+@pytest.fixture
+def expected():
+    return pd.DataFrame({
+        'MondayDate': pd.to_datetime(['2024-01-01', '2024-01-15']).astype('datetime64[ms]'),
+        'MondayHigh': [1.10, 1.20],
+        'MondayLow': [1.00, 1.00],
+        'HighBreakDay': pd.array([1, pd.NA], dtype='Int8'),
+        'LowBreakDay': pd.array([3, pd.NA], dtype='Int8')
+    }, index=pd.MultiIndex.from_arrays(
+        [pd.array([2024, 2024], dtype='uint16'), pd.array([1, 3], dtype='uint8')],
+        names=['Year', 'Week']
+    ))
+
+def test_pandas_backend(candles_csv, expected):
+    df = load_data(candles_csv, fast_io=False)
+    weeks = compute_week_breaks(df, backend='pandas')
+    pd.testing.assert_frame_equal(weeks, expected)
+
+def test_numba_backend_matches_pandas(candles_csv):
+    pytest.importorskip('numba')
+    df = load_data(candles_csv, fast_io=False)
+    pd.testing.assert_frame_equal(
+        compute_week_breaks(df, backend='numba'), compute_week_breaks(df, backend='pandas')
+    )
+
+def test_polars_backend_matches_pandas(candles_csv):
+    pytest.importorskip('polars')
+    df = load_data(candles_csv, fast_io=False)
+    expected = compute_week_breaks(df, backend='pandas')
+    # First call parses the CSV and writes the cache, the second reads the cache
+    pd.testing.assert_frame_equal(scan_week_breaks(candles_csv), expected)
+    pd.testing.assert_frame_equal(scan_week_breaks(candles_csv), expected)
+
+def test_unknown_backend(candles_csv):
+    with pytest.raises(ValueError):
+        compute_week_breaks(load_data(candles_csv, fast_io=False), backend='cuda')
+
+def test_numba_backend_requires_numba(candles_csv, monkeypatch):
+    monkeypatch.setattr(week_breaks, 'NUMBA_AVAILABLE', False)
+    with pytest.raises(ImportError):
+        compute_week_breaks(load_data(candles_csv, fast_io=False), backend='numba')
@@ -0,0 +1,466 @@
+import importlib.util
+import logging
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# polars and numba are slow to import, so only check that they are installed here and
+# import them where they are used
+POLARS_AVAILABLE = importlib.util.find_spec('polars') is not None
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+# Importing numba and loading the cached kernel costs about 0.35 s, while the kernel saves
+# about 0.085 us per row over the pandas path, so backend='auto' only picks it from the
+# break-even point of roughly 4M rows
+NUMBA_MIN_ROWS = 4_000_000
+
+logger = logging.getLogger(__name__)
+
+# Day names indexed by DayOfWeek (Monday is the reference day and never breaks)
+DAY_NAMES = ('', 'Tuesday', 'Wednesday', 'Thursday', 'Friday')
+
+def load_data(file_path: str, fast_io: bool = True) -> pd.DataFrame:
+    """
+    Load and prepare the candle data for analysis.
+
+    Args:
+        file_path: Path to the CSV file containing candle data
+        fast_io: Use the Parquet cache next to the CSV or the multi-threaded pyarrow CSV
+            reader when pyarrow is installed; a CSV read refreshes the cache
+
+    Returns:
+        DataFrame sorted by Date with Date, High, Low, DayOfWeek and WeekId columns
+    """
+    try:
+        # Only Date, High and Low are used; read the prices with a fixed dtype
+        columns = ['Date', 'High', 'Low']
+        dtypes = {'High': 'float64', 'Low': 'float64'}
+        parquet_path = os.path.splitext(file_path)[0] + '.parquet'
+        if fast_io and PYARROW_AVAILABLE and parquet_is_fresh(parquet_path, file_path):
+            df = pd.read_parquet(parquet_path, columns=columns)
+        elif fast_io and PYARROW_AVAILABLE:
+            df = pd.read_csv(
+                file_path, sep=';', decimal=',', usecols=columns, dtype=dtypes,
+                engine='pyarrow', dtype_backend='pyarrow'
+            )
+            # Arrow already parses the ISO dates to date32; only cast to datetime
+            df['Date'] = df['Date'].astype('datetime64[ms]')
+            # Cache the parsed columns so later runs skip the CSV
+            write_parquet_cache(df, parquet_path)
+        else:
+            df = pd.read_csv(
+                file_path, sep=';', decimal=',', usecols=columns, dtype=dtypes,
+                parse_dates=['Date'], date_format='%Y-%m-%d'
+            )
+            # Match the resolution of the Arrow reader and the Parquet cache
+            df['Date'] = df['Date'].astype('datetime64[ms]')
+        df = df.sort_values('Date', kind='mergesort', ignore_index=True)
+        df['DayOfWeek'] = df['Date'].dt.dayofweek.astype('uint8')
+        df['WeekId'] = week_ids(df['Date'])
+        return df
+    except Exception as e:
+        logger.error(f"Error loading data: {str(e)}")
+        raise
+
+def write_parquet_cache(df: pd.DataFrame, parquet_path: str) -> None:
+    """
+    Write the Parquet cache read by load_data and scan_week_breaks.
+
+    Every writer goes through here so the cache always has the same schema: Date as
+    millisecond datetimes plus float64 High and Low, zstd compressed. Failures are
+    logged and ignored since the CSV can always be read instead.
+
+    Args:
+        df: Candle data with at least Date, High and Low columns
+        parquet_path: Path to write the cache to
+    """
+    if not PYARROW_AVAILABLE:
+        return
+    try:
+        cache = df[['Date', 'High', 'Low']].astype({'Date': 'datetime64[ms]', 'High': 'float64', 'Low': 'float64'})
+        cache.to_parquet(parquet_path, index=False, compression='zstd')
+    except (OSError, pa.ArrowException) as e:
+        logger.warning(f"Could not write Parquet cache {parquet_path}: {str(e)}")
+
+def parquet_is_fresh(parquet_path: str, file_path: str) -> bool:
+    """
+    Check whether a Parquet cache exists and is at least as new as its source CSV.
+
+    Args:
+        parquet_path: Path to the Parquet cache
+        file_path: Path to the CSV it was built from
+
+    Returns:
+        True if the cache can be read instead of the CSV
+    """
+    return os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path)
+
+def week_ids(dates: pd.Series) -> np.ndarray:
+    """
+    Number Monday-anchored weeks since the Unix epoch.
+
+    Args:
+        dates: Series of datetimes
+
+    Returns:
+        Array of week ids; all days of one ISO week share the same id
+    """
+    days = dates.to_numpy(dtype='datetime64[D]').view(np.int64)
+    # 1970-01-01 was a Thursday, so shift by three days to start weeks on Monday
+    return (days + 3) // 7
+
+def iso_week_index(dates: pd.Series) -> pd.MultiIndex:
+    """
+    Build a (Year, Week) ISO calendar index for the given dates.
+
+    Args:
+        dates: Series of datetimes
+
+    Returns:
+        MultiIndex with uint16 Year and uint8 Week levels
+    """
+    iso = dates.dt.isocalendar()
+    return pd.MultiIndex.from_arrays(
+        [iso['year'].astype('uint16').to_numpy(), iso['week'].astype('uint8').to_numpy()],
+        names=['Year', 'Week']
+    )
+
+def sort_by_week(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Order candle data by (WeekId, DayOfWeek), skipping the sort if it is already by date.
+
+    Args:
+        df: DataFrame containing the candle data with Date, DayOfWeek and WeekId columns
+
+    Returns:
+        DataFrame with each week's rows contiguous and ordered by DayOfWeek
+    """
+    if df['Date'].is_monotonic_increasing:
+        return df
+    return df.sort_values(['WeekId', 'DayOfWeek'], kind='mergesort')
+
+def _detect_breaks(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    dows: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scan week segments of rows sorted by (week, DayOfWeek) for Monday range breaks.
+
+    Args:
+        starts: First row of each week segment
+        ends: One past the last row of each week segment
+        dows: DayOfWeek per row
+        highs: High per row
+        lows: Low per row
+
+    Returns:
+        Tuple containing per-week arrays:
+        - monday_row: Row of the week's Monday candle, -1 if the week has none
+        - first_high_break: First day above Monday's high, -1 if never
+        - first_low_break: First day below Monday's low, -1 if never
+    """
+    n_weeks = starts.shape[0]
+    monday_row = np.full(n_weeks, -1, dtype=np.int64)
+    first_high_break = np.full(n_weeks, -1, dtype=np.int8)
+    first_low_break = np.full(n_weeks, -1, dtype=np.int8)
+
+    for w in range(n_weeks):
+        monday = -1
+        for i in range(starts[w], ends[w]):
+            day = dows[i]
+            if day == 0:
+                if monday < 0:
+                    monday = i
+            elif monday >= 0 and day <= 4:
+                if first_high_break[w] < 0 and highs[i] > highs[monday]:
+                    first_high_break[w] = day
+                if first_low_break[w] < 0 and lows[i] < lows[monday]:
+                    first_low_break[w] = day
+        monday_row[w] = monday
+
+    return monday_row, first_high_break, first_low_break
+
+@lru_cache(maxsize=None)
+def _jit_detect_breaks():
+    """
+    Compile _detect_breaks with Numba on first use.
+
+    Returns:
+        The jitted kernel
+    """
+    from numba import njit
+    return njit(cache=True)(_detect_breaks)
+
+def compute_week_breaks(df: pd.DataFrame, backend: str = 'auto') -> pd.DataFrame:
+    """
+    Compute Monday's range and the first day it was broken for every week.
+
+    Args:
+        df: DataFrame containing the candle data with Date, DayOfWeek and WeekId columns
+        backend: 'pandas', 'numba', or 'auto' to use the Numba kernel when numba is
+            installed and the frame has at least NUMBA_MIN_ROWS rows
+
+    Returns:
+        DataFrame indexed by (Year, Week) with one row per week that has a Monday:
+        - MondayDate: Date of the Monday candle
+        - MondayHigh: High of the Monday candle
+        - MondayLow: Low of the Monday candle
+        - HighBreakDay: First day (1=Tuesday ... 4=Friday) above Monday's high, <NA> if never
+        - LowBreakDay: First day (1=Tuesday ... 4=Friday) below Monday's low, <NA> if never
+    """
+    if backend == 'auto':
+        backend = 'numba' if NUMBA_AVAILABLE and len(df) >= NUMBA_MIN_ROWS else 'pandas'
+    elif backend not in ('pandas', 'numba'):
+        raise ValueError(f"Unknown backend: {backend}")
+    elif backend == 'numba' and not NUMBA_AVAILABLE:
+        raise ImportError("The numba backend requires numba")
+
+    df_sorted = sort_by_week(df)
+    if backend == 'numba':
+        return _compute_week_breaks_numba(df_sorted)
+
+    # One Monday row per week, joined onto the Tuesday-Friday rows of the same week
+    weeks = (
+        df_sorted[df_sorted['DayOfWeek'] == 0]
+        .groupby('WeekId', sort=False)
+        .agg(MondayDate=('Date', 'first'), MondayHigh=('High', 'first'), MondayLow=('Low', 'first'))
+    )
+    rest_mask = (df_sorted['DayOfWeek'] >= 1) & (df_sorted['DayOfWeek'] <= 4)
+    rest = (
+        df_sorted.loc[rest_mask, ['WeekId', 'DayOfWeek', 'High', 'Low']]
+        .join(weeks[['MondayHigh', 'MondayLow']], on='WeekId', how='inner')
+        .reset_index(drop=True)
+    )
+    week_id = rest['WeekId'].to_numpy()
+    dows = rest['DayOfWeek'].to_numpy()
+    high_broken = rest['High'].to_numpy() > rest['MondayHigh'].to_numpy()
+    low_broken = rest['Low'].to_numpy() < rest['MondayLow'].to_numpy()
+
+    weeks['HighBreakDay'] = _first_break_day(week_id, dows, high_broken).reindex(weeks.index).astype('Int8')
+    weeks['LowBreakDay'] = _first_break_day(week_id, dows, low_broken).reindex(weeks.index).astype('Int8')
+
+    # Map week ids back to ISO (Year, Week) only for the one Monday row per week
+    weeks.index = iso_week_index(weeks['MondayDate'])
+    return weeks
+
+def _first_break_day(week_id: np.ndarray, dows: np.ndarray, broken: np.ndarray) -> pd.Series:
+    """
+    Find the first breaking day of each week from a per-row break mask.
+
+    Args:
+        week_id: WeekId per row, rows sorted by (WeekId, DayOfWeek)
+        dows: DayOfWeek per row
+        broken: Whether the row broke the Monday level
+
+    Returns:
+        First breaking DayOfWeek indexed by WeekId, only for weeks that broke
+    """
+    rows = np.flatnonzero(broken)
+    broken_weeks = week_id[rows]
+    # Rows are sorted within a week, so the first broken row of each week is the first break
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = broken_weeks[1:] != broken_weeks[:-1]
+    return pd.Series(dows[rows[first]], index=broken_weeks[first])
+
+def _kernel_inputs(df_sorted: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split candle data sorted by (WeekId, DayOfWeek) into the arrays the Numba kernels scan.
+
+    Args:
+        df_sorted: Candle data sorted by (WeekId, DayOfWeek)
+
+    Returns:
+        Tuple of (starts, ends, dows, highs, lows) arrays
+    """
+    week_id = df_sorted['WeekId'].to_numpy(dtype=np.int64)
+    # Rows are already grouped by week, so each week starts where the id changes
+    boundaries = np.flatnonzero(np.diff(week_id)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.append(boundaries, len(week_id))
+    return (
+        starts,
+        ends,
+        df_sorted['DayOfWeek'].to_numpy(dtype=np.int8),
+        df_sorted['High'].to_numpy(dtype=np.float64),
+        df_sorted['Low'].to_numpy(dtype=np.float64)
+    )
+
+def _compute_week_breaks_numba(df_sorted: pd.DataFrame) -> pd.DataFrame:
+    """
+    compute_week_breaks backend that runs the _detect_breaks kernel over NumPy arrays.
+
+    Args:
+        df_sorted: Candle data sorted by (WeekId, DayOfWeek)
+
+    Returns:
+        DataFrame in the same layout as compute_week_breaks
+    """
+    monday_row, first_high_break, first_low_break = _jit_detect_breaks()(*_kernel_inputs(df_sorted))
+
+    has_monday = monday_row >= 0
+    first_high_break = first_high_break[has_monday]
+    first_low_break = first_low_break[has_monday]
+
+    weeks = _monday_frame(df_sorted, monday_row[has_monday])
+    weeks['HighBreakDay'] = pd.arrays.IntegerArray(first_high_break, first_high_break < 0)
+    weeks['LowBreakDay'] = pd.arrays.IntegerArray(first_low_break, first_low_break < 0)
+    return weeks
+
+def _monday_frame(df_sorted: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    """
+    Build the Monday date/high/low columns for the given Monday rows.
+
+    Args:
+        df_sorted: Candle data sorted by (WeekId, DayOfWeek)
+        rows: Positions of the Monday candles in df_sorted
+
+    Returns:
+        DataFrame with MondayDate, MondayHigh and MondayLow indexed by (Year, Week)
+    """
+    # Gather the Monday values straight from the column arrays instead of slicing the frame
+    monday_dates = pd.Series(df_sorted['Date'].to_numpy()[rows])
+    return pd.DataFrame({
+        'MondayDate': monday_dates.to_numpy(),
+        'MondayHigh': df_sorted['High'].to_numpy(dtype=np.float64)[rows],
+        'MondayLow': df_sorted['Low'].to_numpy(dtype=np.float64)[rows]
+    }, index=iso_week_index(monday_dates))
+
+def summarize_week_breaks(weeks: pd.DataFrame) -> tuple[int, int, int, int, np.ndarray, np.ndarray, pd.DataFrame]:
+    """
+    Fold a per-week break frame into overall Monday range break counts.
+
+    Args:
+        weeks: Per-week break DataFrame as returned by compute_week_breaks or scan_week_breaks
+
+    Returns:
+        Tuple containing:
+        - total_mondays: Total number of Mondays analyzed
+        - monday_highs_taken: Number of times Monday's high was broken
+        - monday_lows_taken: Number of times Monday's low was broken
+        - both_broken: Number of times both high and low were broken
+        - day_high_break: Break counts indexed by day (1=Tuesday ... 4=Friday) for Monday's high
+        - day_low_break: Break counts indexed by day (1=Tuesday ... 4=Friday) for Monday's low
+        - unbroken_weeks: MondayDate/MondayHigh/MondayLow indexed by (Year, Week) for weeks
+          where neither level was broken
+    """
+    high_broken = weeks['HighBreakDay'].notna()
+    low_broken = weeks['LowBreakDay'].notna()
+    return (
+        len(weeks),
+        int(high_broken.sum()),
+        int(low_broken.sum()),
+        int((high_broken & low_broken).sum()),
+        np.bincount(weeks['HighBreakDay'].dropna().to_numpy(dtype=np.int64), minlength=5),
+        np.bincount(weeks['LowBreakDay'].dropna().to_numpy(dtype=np.int64), minlength=5),
+        weeks.loc[~high_broken & ~low_broken, ['MondayDate', 'MondayHigh', 'MondayLow']]
+    )
+
+def calculate_probabilities(
+    total_mondays: int,
+    monday_highs_taken: int,
+    monday_lows_taken: int,
+    both_broken: int,
+    day_high_break: np.ndarray,
+    day_low_break: np.ndarray
+) -> tuple[float, float, dict[str, float], dict[str, float]]:
+    """
+    Calculate break probabilities from the counts returned by summarize_week_breaks.
+
+    Args:
+        total_mondays: Total number of Mondays analyzed
+        monday_highs_taken: Number of times Monday's high was broken
+        monday_lows_taken: Number of times Monday's low was broken
+        both_broken: Number of times both high and low were broken
+        day_high_break: Break counts indexed by day for Monday's high
+        day_low_break: Break counts indexed by day for Monday's low
+
+    Returns:
+        Tuple containing:
+        - high_break_prob: Probability of Monday's high being broken
+        - low_break_prob: Probability of Monday's low being broken
+        - day_high_probs: Dictionary of day-specific probabilities for high breaks
+        - day_low_probs: Dictionary of day-specific probabilities for low breaks
+    """
+    high_break_prob = monday_highs_taken / total_mondays if total_mondays > 0 else 0
+    low_break_prob = monday_lows_taken / total_mondays if total_mondays > 0 else 0
+
+    # Break counts are all zero when the level was never taken, so dividing by 1 gives 0%
+    high_probs = day_high_break[1:5] / max(monday_highs_taken, 1)
+    low_probs = day_low_break[1:5] / max(monday_lows_taken, 1)
+    day_high_probs = dict(zip(DAY_NAMES[1:5], high_probs.tolist()))
+    day_low_probs = dict(zip(DAY_NAMES[1:5], low_probs.tolist()))
+
+    return high_break_prob, low_break_prob, day_high_probs, day_low_probs
+
+def scan_week_breaks(file_path: str) -> pd.DataFrame:
+    """
+    Polars lazy-query equivalent of compute_week_breaks that reads the filtered CSV directly.
+
+    Reads the Parquet cache next to the CSV instead when it is at least as new as the CSV,
+    and writes the cache after a CSV read.
+
+    Args:
+        file_path: Path to the filtered CSV file containing candle data
+
+    Returns:
+        DataFrame in the same layout as compute_week_breaks
+    """
+    if not POLARS_AVAILABLE:
+        raise ImportError("scan_week_breaks requires polars")
+    import polars as pl
+
+    is_monday = pl.col('DayOfWeek') == 0
+    rest_of_week = pl.col('DayOfWeek').is_between(1, 4)
+    monday_high = pl.col('High').filter(is_monday).first()
+    monday_low = pl.col('Low').filter(is_monday).first()
+
+    parquet_path = os.path.splitext(file_path)[0] + '.parquet'
+    if parquet_is_fresh(parquet_path, file_path):
+        candles = pl.scan_parquet(parquet_path).select(pl.col('Date').cast(pl.Date), 'High', 'Low')
+    else:
+        candles = (
+            pl.scan_csv(file_path, separator=';', decimal_comma=True)
+            .select(pl.col('Date').str.to_date('%Y-%m-%d'), 'High', 'Low')
+            .collect()
+        )
+        # Cache the parsed columns so later runs skip the CSV
+        if PYARROW_AVAILABLE:
+            write_parquet_cache(candles.to_pandas(), parquet_path)
+        candles = candles.lazy()
+
+    weeks = (
+        candles
+        .with_columns(
+            (pl.col('Date').dt.weekday() - 1).cast(pl.UInt8).alias('DayOfWeek'),
+            pl.col('Date').dt.week().cast(pl.UInt8).alias('Week'),
+            pl.col('Date').dt.iso_year().cast(pl.UInt16).alias('Year')
+        )
+        .group_by(['Year', 'Week'])
+        .agg(
+            pl.col('Date').filter(is_monday).first().alias('MondayDate'),
+            monday_high.alias('MondayHigh'),
+            monday_low.alias('MondayLow'),
+            pl.col('DayOfWeek').filter(rest_of_week & (pl.col('High') > monday_high)).min().alias('HighBreakDay'),
+            pl.col('DayOfWeek').filter(rest_of_week & (pl.col('Low') < monday_low)).min().alias('LowBreakDay')
+        )
+        .filter(pl.col('MondayDate').is_not_null())
+        .sort(['Year', 'Week'])
+        .collect()
+    )
+
+    weeks = weeks.to_pandas().set_index(['Year', 'Week'])
+    weeks['MondayDate'] = pd.to_datetime(weeks['MondayDate'])
+    weeks['HighBreakDay'] = weeks['HighBreakDay'].astype('Int8')
+    weeks['LowBreakDay'] = weeks['LowBreakDay'].astype('Int8')
+    return weeks